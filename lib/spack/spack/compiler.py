@@ -346,7 +346,8 @@ def real_version(self):
             try:
                 self._real_version = spack.version.Version(
                     self.get_real_version())
-            except spack.util.executable.ProcessError:
+            except (spack.util.executable.ProcessError, ValueError):
+                # ValueError means the output wasn't a valid version
                 self._real_version = self.version
         return self._real_version
 
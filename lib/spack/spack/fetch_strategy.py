@@ -766,8 +766,11 @@ def __init__(self, **kwargs):
 
     @property
     def git_version(self):
-        vstring = self.git('--version', output=str).lstrip('git version ')
-        return Version(vstring)
+        output = self.git('--version', output=str)
+        # Some builds print more after the version, e.g. Apple's prints
+        # "git version 2.24.3 (Apple Git-128)"
+        match = re.search(r'git version (\S+)', output)
+        return Version(match.group(1) if match else output.strip())
 
     @property
     def git(self):
@@ -1437,9 +1437,10 @@ def define_version_constraints(self):
         """Define what version_satisfies(...) means in ASP logic."""
         for pkg_name, versions in sorted(self.version_constraints):
             # version must be *one* of the ones the spec allows.
+            satisfies = versions.compile_satisfies()
             allowed_versions = [
                 v for v in sorted(self.possible_versions[pkg_name])
-                if v.satisfies(versions)
+                if satisfies(v)
             ]
 
             # This is needed to account for a variable number of
@@ -10,6 +10,7 @@
 
 from llnl.util.filesystem import mkdirp
 
+from spack.fetch_strategy import GitFetchStrategy
 from spack.util.executable import which
 from spack.version import ver
 
@@ -28,7 +29,8 @@ def check_git_version():
     Refer:
     https://github.com/git/git/commit/cc73385cf6c5c229458775bc92e7dbbe24d11611
     """
-    git_version = ver(git('--version', output=str).lstrip('git version '))
+    git_version = GitFetchStrategy(
+        git='file:///not-a-real-git-repo').git_version
     return git_version >= ver(git_required_version)
 
 
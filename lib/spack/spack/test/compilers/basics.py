@@ -19,6 +19,7 @@
 import spack.compilers as compilers
 import spack.spec
 import spack.util.environment
+import spack.version
 
 from spack.compiler import Compiler
 from spack.util.executable import ProcessError
@@ -836,6 +837,18 @@ def test_compiler_flags_use_real_version(working_env, monkeypatch, tmpdir):
     assert flag == '-std=c++0x'
 
 
+def test_compiler_real_version_with_bad_output(monkeypatch):
+    gcc_cls = compilers.class_for_compiler_name('gcc')
+    compiler = gcc_cls(
+        spack.spec.CompilerSpec('gcc@9.3.0'), 'fake', 'fake',
+        ['/usr/bin/gcc', None, None, None])
+
+    # Output that isn't a version falls back to the configured version
+    monkeypatch.setattr(
+        gcc_cls, 'get_real_version', lambda x: 'gcc (GCC) 9.3.0')
+    assert compiler.real_version == spack.version.Version('9.3.0')
+
+
 def test_apple_clang_setup_environment(mock_executable, monkeypatch):
     """Test a code path that is taken only if the package uses
     Xcode on MacOS.
@@ -36,8 +36,8 @@ def git_version(request, monkeypatch):
     paths for old versions still work, we fake it out here and make it
     use the backward-compatibility code paths with newer git versions.
     """
-    git = which('git', required=True)
-    real_git_version = ver(git('--version', output=str).lstrip('git version '))
+    real_git_version = GitFetchStrategy(
+        git='file:///not-a-real-git-repo').git_version
 
     if request.param is None:
         # Don't patch; run with the real git_version method.
@@ -71,6 +71,20 @@ def bad_git(*args, **kwargs):
     yield
 
 
+@pytest.mark.parametrize('output,expected', [
+    ('git version 2.28.0\n', '2.28.0'),
+    ('git version 2.24.3 (Apple Git-128)\n', '2.24.3'),
+    ('git version 2.29.2.windows.2\n', '2.29.2.windows.2'),
+])
+def test_git_version_from_output(monkeypatch, output, expected):
+    def mock_git(*args, **kwargs):
+        return output
+
+    monkeypatch.setattr(GitFetchStrategy, 'git', mock_git)
+    fetcher = GitFetchStrategy(git='file:///not-a-real-git-repo')
+    assert fetcher.git_version == ver(expected)
+
+
 def test_bad_git(tmpdir, mock_bad_git):
     """Trigger a SpackError when attempt a fetch with a bad git."""
     testpath = str(tmpdir)
@@ -7,8 +7,11 @@
 We try to maintain compatibility with RPM's version semantics
 where it makes sense.
 """
+import pickle
+
 import pytest
 
+import spack.version
 from spack.version import Version, VersionList, ver
 
 
@@ -180,6 +183,20 @@ def test_num_alpha_with_no_separator():
     assert_ver_gt('xyz10.1', 'xyz10')
 
 
+def test_large_numbers():
+    assert_ver_lt('1.255', '1.256')
+    assert_ver_lt('1.256', '1.65536')
+    assert_ver_lt('20200101', '20200102')
+    assert_ver_lt('1.99999999999999999999', '2')
+    assert_ver_gt('1.100000000000000000000', '1.99999999999999999999')
+
+
+def test_mixed_case_letters():
+    assert_ver_lt('1.0B', '1.0a')
+    assert_ver_lt('1.0a', '1.0ab')
+    assert_ver_lt('1.0ab', '1.0b')
+
+
 def test_alpha_with_dots():
     assert_ver_eq('xyz.4', 'xyz.4')
     assert_ver_lt('xyz.4', '8')
@@ -291,6 +308,10 @@ def test_in_list():
     assert_not_in('1.2.5:1.5', ['1.5', '1.2:1.3'])
     assert_not_in('1.1:1.2.5', ['1.5', '1.2:1.3'])
 
+    assert_in(['1.0:1.5', '3'], ['1.0:2.0', '3'])
+    assert_in(['1.2', '1.5.1'], ['1.0:1.3', '1.5'])
+    assert_not_in(['1.0:1.5', '4'], ['1.0:2.0', '3'])
+
 
 def test_ranges_overlap():
     assert_overlaps('1.2', '1.2')
@@ -366,6 +387,15 @@ def test_intersection():
     check_intersection(['0:1'], [':'], ['0:1'])
 
 
+def test_intersection_with_long_list():
+    releases = ['1.%d' % i for i in range(30)] + ['develop']
+    check_intersection(['1.3', '1.4', '1.5'], releases, ['1.3:1.5'])
+    check_intersection(['1.3', '1.4', '1.5'], ['1.3:1.5'], releases)
+    check_intersection(['1.0', '1.29', 'develop'], releases, [':1.0', '1.29:'])
+    check_intersection(['1.2', 'develop'], releases, ['1.2', '2.0:'])
+    check_intersection([], releases, ['0.1:0.9'])
+
+
 def test_intersect_with_containment():
     check_intersection('1.6.5', '1.6.5', ':1.6')
     check_intersection('1.6.5', ':1.6', '1.6.5')
@@ -373,6 +403,11 @@ def test_intersect_with_containment():
     check_intersection('1.6:1.6.5', ':1.6.5', '1.6')
     check_intersection('1.6:1.6.5', '1.6', ':1.6.5')
 
+    check_intersection(['1.6.5', '1.6.7'], [':1.6'], ['1.6.5', '1.6.7'])
+    check_intersection(['1.6.5', '1.6.7'], ['1.6.5', '1.6.7'], [':1.6'])
+    check_intersection(['1.6.5', '1.7:1.8'],
+                       ['1.6.5:1.6.8', '1.7:'], [':1.6.5', '1.7:1.8'])
+
 
 def test_union_with_containment():
     check_union(':1.6', '1.6.5', ':1.6')
@@ -389,6 +424,14 @@ def test_union_with_containment():
     # Tests successor/predecessor case.
     check_union('1:4', '1:2', '3:4')
 
+    # Lists are merged element by element
+    check_union(['1.0:1.4', '1.8', '2.0:'],
+                ['1.0:1.3', '2.0:2.2'], ['1.2:1.4', '1.8', '2.1:'])
+
+    vlist = VersionList(['1.0:1.3', '2.0:2.2'])
+    vlist.update(VersionList(['1.2:1.4', '1.8', '2.1:']))
+    assert vlist == VersionList(['1.0:1.4', '1.8', '2.0:'])
+
 
 def test_basic_version_satisfaction():
     assert_satisfies('4.7.3',   '4.7.3')
@@ -477,6 +520,17 @@ def test_formatted_strings():
         assert v.dotted.dotted.string == '1.2.3b'
         assert v.dotted.joined.string == '123b'
 
+        # Versions are interned, so repeated conversions share objects
+        assert v.dotted is Version('1.2.3b')
+        assert v.dotted.dotted is v.dotted
+
+
+def test_format_spec():
+    v = Version('1.2.3')
+    assert '{0}'.format(v) == '1.2.3'
+    assert '{0:>7}'.format(v) == '  1.2.3'
+    assert '{0:<7}|'.format(v) == '1.2.3  |'
+
 
 def test_up_to():
     v = Version('1.23-4_5b')
@@ -520,6 +574,19 @@ def check_repr_and_str(vrs):
     check_repr_and_str('R2016a.2-3_4')
 
 
+@pytest.mark.parametrize('string,segments,separators', [
+    ('1.23-4_5b', (1, 23, 4, 5, 'b'), ('.', '-', '_', '', '')),
+    ('1a', (1, 'a'), ('', '')),
+    ('1.2.', (1, 2), ('.', '.')),
+    ('.1', (1,), ('',)),
+    ('develop', ('develop',), ('',)),
+])
+def test_version_parsing(string, segments, separators):
+    v = Version(string)
+    assert v.version == segments
+    assert v.separators == separators
+
+
 def test_len():
     a = Version('1.2.3.4')
     assert len(a) == len(a.version)
@@ -562,3 +629,123 @@ def test_list_highest():
     assert vl2.highest_numeric() is None
     assert vl2.preferred() == Version('develop')
     assert vl2.lowest() == Version('master')
+
+
+@pytest.mark.parametrize('version_str', [
+    '1.2$', '1.2 beta', '1.2/3', '', '@1.2'
+])
+def test_invalid_version_characters(version_str):
+    with pytest.raises(ValueError):
+        Version(version_str)
+
+
+def test_versions_are_interned():
+    a = Version('1.2.3')
+    assert Version('1.2.3') is a
+    assert Version(' 1.2.3 ') is a
+    assert Version(a) is a
+    assert ver('1.2.3') is a
+    assert Version('1.2.3-4')[:3] is a
+    assert Version('1.2.4') is not a
+
+    assert ver('1.2:1.4') is ver('1.2:1.4')
+    first, second = VersionList(['1.2:1.4', '2.0']), ver('1.2:1.4,2.0')
+    assert all(x is y for x, y in zip(first, second))
+
+
+@pytest.mark.parametrize('protocol', range(pickle.HIGHEST_PROTOCOL + 1))
+@pytest.mark.parametrize('version_str', [
+    '1.2.3', '1.2:1.4', ':1.4', '1.2,1.4:1.6,develop', ''
+])
+def test_pickle_round_trip(protocol, version_str):
+    vlist = VersionList(version_str) if version_str else VersionList()
+    for v in [vlist] + list(vlist):
+        copy = pickle.loads(pickle.dumps(v, protocol))
+        assert type(copy) == type(v)
+        assert copy == v
+
+
+def test_version_equality_with_other_types():
+    v = Version('1.2')
+    assert v == ver('1.2:1.2')
+    assert v == VersionList(['1.2'])
+    assert not v != ver('1.2:1.2')
+    assert v != ver('1.2:1.3')
+    assert v != None  # noqa: E711
+    assert not v == None  # noqa: E711
+
+
+def test_list_hash_follows_changes():
+    vlist = VersionList(['1.2', '1.4:1.6'])
+    assert hash(vlist) == hash(VersionList(['1.2', '1.4:1.6']))
+
+    vlist.add(ver('2.0'))
+    assert hash(vlist) == hash(VersionList(['1.2', '1.4:1.6', '2.0']))
+
+    vlist.intersect(ver('1.5:'))
+    assert hash(vlist) == hash(VersionList(['1.5:1.6', '2.0']))
+
+
+def test_parsed_lists_are_not_shared():
+    vlist = ver('1.2,1.4:1.6')
+    vlist.add(ver('2.0'))
+    assert ver('1.2,1.4:1.6') == VersionList(['1.2', '1.4:1.6'])
+
+    vlist = VersionList('1.2,1.4:1.6')
+    vlist.intersect(ver('1.5:'))
+    assert VersionList('1.2,1.4:1.6') == VersionList(['1.2', '1.4:1.6'])
+
+
+def test_parse_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(spack.version, '_string_to_version_cache', {})
+    monkeypatch.setattr(spack.version, '_parse_cache_size', 2)
+
+    for v in ['1.0', '1.1:1.2', '1.3,1.4']:
+        ver(v)
+    assert len(spack.version._string_to_version_cache) == 2
+    assert ver('1.3,1.4') == VersionList(['1.3', '1.4'])
+
+
+def test_frozen_list_can_change():
+    vlist = VersionList(['1.2', '1.4:1.6'])
+    vlist.freeze()
+    copy = VersionList()
+    copy.versions = vlist.versions
+
+    copy.add(ver('2.0'))
+    assert copy == VersionList(['1.2', '1.4:1.6', '2.0'])
+    assert vlist == VersionList(['1.2', '1.4:1.6'])
+
+    vlist.intersect(ver('1.5:'))
+    assert vlist == VersionList(['1.5:1.6'])
+    assert repr(vlist) == repr(VersionList(['1.5:1.6']))
+
+
+@pytest.mark.parametrize('vlist', [
+    VersionList(), VersionList(['1.2']), VersionList(['1.2:1.4', 'develop']),
+    VersionList([':1.0', '1.2', '1.4:1.6', '2.0:']),
+])
+def test_dict_round_trip(vlist):
+    assert VersionList.from_dict(vlist.to_dict()) == vlist
+
+
+@pytest.mark.parametrize('vlist', [
+    '', '1.2', '1.2:1.4', '1.2:1.4,2.0,3.1:', ':1.0,develop',
+])
+def test_compile_satisfies(vlist):
+    vlist = VersionList(vlist) if vlist else VersionList()
+    satisfies = vlist.compile_satisfies()
+    for v in ['0.9', '1.0.1', '1.2', '1.2.5', '1.4.2', '1.5', '2.0',
+              '2.0.1', '3.1', '4', 'develop']:
+        assert satisfies(Version(v)) == Version(v).satisfies(vlist)
+
+
+def test_frozen_and_unfrozen_lists_compare():
+    frozen, thawed = VersionList(['1.2', '1.4:1.6']), VersionList(['1.2'])
+    frozen.freeze()
+    assert frozen != thawed and thawed != frozen
+    assert thawed < frozen and not frozen < thawed
+
+    thawed.add(ver('1.4:1.6'))
+    assert frozen == thawed and thawed == frozen
+    assert not thawed < frozen and not frozen < thawed
@@ -26,6 +26,8 @@
 """
 import re
 import numbers
+import operator
+import weakref
 from bisect import bisect_left
 from functools import wraps
 from six import string_types
@@ -39,16 +41,94 @@
 # Valid version characters
 VALID_VERSION = r'[A-Za-z0-9_.-]'
 
+# Precompiled patterns used when parsing version strings.  The version
+# pattern is anchored at both ends so that the whole string is checked.
+# The segment pattern is a group so that splitting on it also returns
+# the segments themselves.
+_VALID_VERSION_RE = re.compile(r'%s+\Z' % VALID_VERSION)
+_SEGMENT_RE = re.compile(r'([a-zA-Z]+|[0-9]+)')
+
+# Versions are immutable, so parsing the same string twice can return the
+# same object.  Entries go away when nothing else references the Version,
+# though the bounded cache of _string_to_version() keeps some alive.
+_version_cache = weakref.WeakValueDictionary()
+
 # Infinity-like versions. The order in the list implies the comparison rules
 infinity_versions = ['develop', 'main', 'master', 'head', 'trunk']
+_INF_SET = frozenset(infinity_versions)
+
+# Rank of each infinity-like version; earlier entries in the list are greater
+_INF_RANK = dict(
+    (v, len(infinity_versions) - i) for i, v in enumerate(infinity_versions))
+
+
+# Maximum number of entries in each cache of parsing results below.  Once
+# a cache is full, new results are no longer added to it.
+_parse_cache_size = 4096
+
+# Results of int_if_int().  The same segments (0, 1, 2, rc, ...) show up
+# in many versions, and failed int() conversions are slow, so a bounded
+# number of them are cached.
+_int_if_int_cache = {}
 
 
 def int_if_int(string):
     """Convert a string to int if possible.  Otherwise, return a string."""
+    value = _int_if_int_cache.get(string)
+    if value is not None:
+        return value
+
     try:
-        return int(string)
+        value = int(string)
     except ValueError:
-        return string
+        value = string
+
+    if len(_int_if_int_cache) < _parse_cache_size:
+        _int_if_int_cache[string] = value
+    return value
+
+
+# Results of _segment_key(), bounded like those of int_if_int().
+_segment_key_cache = {}
+
+
+def _segment_key(segment):
+    """Sort key for a single version segment, as a byte string.
+
+    Infinity-like versions are greater than everything else, and numbers
+    are always "newer" than letters.  This is for consistency with RPM.
+    See patch #60884 (and details) from bugzilla #50977 in the RPM project
+    at rpm.org.  Or look at rpmvercmp.c if you want to see how this is
+    implemented there.
+
+    The key starts with a byte for the kind of segment.  Numbers follow
+    with their length in bytes and then their big-endian bytes, and words
+    follow with their letters and a NUL.  No key is a prefix of another,
+    so the keys of the segments of a version can be joined into one byte
+    string that sorts the same way as the segments themselves.
+    """
+    key = _segment_key_cache.get(segment)
+    if key is not None:
+        return key
+
+    if not isinstance(segment, string_types):
+        digits = []
+        value = segment
+        while value:
+            digits.append(value & 0xff)
+            value >>= 8
+        digits.reverse()
+        key = bytearray([1, len(digits)] + digits)
+    elif segment in _INF_RANK:
+        key = bytearray([2, _INF_RANK[segment]])
+    else:
+        key = bytearray([0]) + bytearray(segment.encode('ascii')) + \
+            bytearray([0])
+    key = bytes(key)
+
+    if len(_segment_key_cache) < _parse_cache_size:
+        _segment_key_cache[segment] = key
+    return key
 
 
 def coerce_versions(a, b):
@@ -83,36 +163,85 @@ def check_type(t):
 
 def coerced(method):
     """Decorator that ensures that argument types of a method are coerced."""
+    name = method.__name__
+
+    # Method to call on the coerced arguments, by type of the first argument
+    dispatch = {}
+
     @wraps(method)
     def coercing_method(a, b, *args, **kwargs):
-        if type(a) == type(b) or a is None or b is None:
+        if type(a) is type(b) or a is None or b is None:
             return method(a, b, *args, **kwargs)
         else:
             ca, cb = coerce_versions(a, b)
-            return getattr(ca, method.__name__)(cb, *args, **kwargs)
+            ta = type(ca)
+            if ta not in dispatch:
+                dispatch[ta] = getattr(ta, name)
+            return dispatch[ta](ca, cb, *args, **kwargs)
     return coercing_method
 
 
+def _compare_coerced(a, b, op, if_none):
+    """Slow path of the ordering and containment operators of Version and
+    VersionRange.
+
+    Coerces a and b to the same type and compares them with op.  Comparing
+    anything with None gives if_none.
+    """
+    if b is None:
+        return if_none
+    ca, cb = coerce_versions(a, b)
+    return op(ca, cb)
+
+
 class Version(object):
-    """Class to represent versions"""
+    """Class to represent versions.
+
+    Versions are interned: constructing a Version from a string that has
+    already been parsed returns the existing object instead of parsing
+    the string again.
+    """
+    __slots__ = ('string', 'version', 'separators', '_cmp_key', '_hash',
+                 '_isdevelop', '__weakref__')
+
+    def __new__(cls, string):
+        # preserve the original string, but trimmed.
+        string = str(string).strip()
 
-    def __init__(self, string):
-        string = str(string)
+        key = (cls, string)
+        version = _version_cache.get(key)
+        if version is not None:
+            return version
 
-        if not re.match(VALID_VERSION, string):
+        if not _VALID_VERSION_RE.match(string):
             raise ValueError("Bad characters in version string: %s" % string)
 
-        # preserve the original string, but trimmed.
-        string = string.strip()
-        self.string = string
+        version = super(Version, cls).__new__(cls)
+        version.string = string
+
+        # Split version into alphabetical and numeric segments, with the
+        # separators from the original version string in between.  The
+        # first element is whatever precedes the first segment.
+        parts = _SEGMENT_RE.split(string)
+        version.version = tuple(int_if_int(seg) for seg in parts[1::2])
+
+        # Store the separators that follow each segment as well.
+        version.separators = tuple(parts[2::2])
+
+        # Precompute the key used for ordering, so comparisons are a single
+        # byte string comparison.  If the common prefix of two versions is
+        # equal, the one with more segments is bigger.
+        version._cmp_key = b''.join(
+            [_segment_key(segment) for segment in version.version])
+        version._hash = hash(version.version)
+        version._isdevelop = any(s in _INF_SET for s in version.version)
 
-        # Split version into alphabetical and numeric segments
-        segment_regex = r'[a-zA-Z]+|[0-9]+'
-        segments = re.findall(segment_regex, string)
-        self.version = tuple(int_if_int(seg) for seg in segments)
+        _version_cache[key] = version
+        return version
 
-        # Store the separators from the original version string as well.
-        self.separators = tuple(re.split(segment_regex, string)[1:])
+    def __reduce__(self):
+        # Go through __new__ so that unpickled versions are interned too
+        return (type(self), (self.string,))
 
     @property
     def dotted(self):
@@ -205,12 +334,7 @@ def highest(self):
 
     def isdevelop(self):
         """Triggers on the special case of the `@develop-like` version."""
-        for inf in infinity_versions:
-            for v in self.version:
-                if v == inf:
-                    return True
-
-        return False
+        return self._isdevelop
 
     @coerced
     def satisfies(self, other):
@@ -219,10 +343,8 @@ def satisfies(self, other):
         gcc@4.7 so that when a user asks to build with gcc@4.7, we can find
         a suitable compiler.
         """
-
-        nself = len(self.version)
-        nother = len(other.version)
-        return nother <= nself and self.version[:nother] == other.version
+        prefix = other.version
+        return self.version[:len(prefix)] == prefix
 
     def __iter__(self):
         return iter(self.version)
@@ -237,16 +359,13 @@ def __getitem__(self, idx):
             return self.version[idx]
 
         elif isinstance(idx, slice):
-            string_arg = []
-
-            pairs = zip(self.version[idx], self.separators[idx])
-            for token, sep in pairs:
-                string_arg.append(str(token))
-                string_arg.append(str(sep))
+            tokens = self.version[idx]
+            separators = self.separators[idx]
 
-            string_arg.pop()  # We don't need the last separator
-            string_arg = ''.join(string_arg)
-            return cls(string_arg)
+            # Join each token with the separator after it, except the last
+            string_arg = ''.join(
+                str(t) + sep for t, sep in zip(tokens, separators[:-1]))
+            return cls(string_arg + str(tokens[-1]))
 
         message = '{cls.__name__} indices must be integers'
         raise TypeError(message.format(cls=cls))
@@ -258,86 +377,57 @@ def __str__(self):
         return self.string
 
     def __format__(self, format_spec):
-        return self.string.format(format_spec)
+        return format(self.string, format_spec)
 
     @property
     def concrete(self):
         return self
 
-    @coerced
     def __lt__(self, other):
         """Version comparison is designed for consistency with the way RPM
            does things.  If you need more complicated versions in installed
            packages, you should override your package's version string to
            express it more sensibly.
         """
-        if other is None:
-            return False
-
-        # Coerce if other is not a Version
-        # simple equality test first.
-        if self.version == other.version:
-            return False
-
-        # Standard comparison of two numeric versions
-        for a, b in zip(self.version, other.version):
-            if a == b:
-                continue
-            else:
-                if a in infinity_versions:
-                    if b in infinity_versions:
-                        return (infinity_versions.index(a) >
-                                infinity_versions.index(b))
-                    else:
-                        return False
-                if b in infinity_versions:
-                    return True
-
-                # Neither a nor b is infinity
-                # Numbers are always "newer" than letters.
-                # This is for consistency with RPM.  See patch
-                # #60884 (and details) from bugzilla #50977 in
-                # the RPM project at rpm.org.  Or look at
-                # rpmvercmp.c if you want to see how this is
-                # implemented there.
-                if type(a) != type(b):
-                    return type(b) == int
-                else:
-                    return a < b
+        if type(other) is Version:
+            return self._cmp_key < other._cmp_key
+        return _compare_coerced(self, other, operator.lt, False)
 
-        # If the common prefix is equal, the one
-        # with more segments is bigger.
-        return len(self.version) < len(other.version)
-
-    @coerced
     def __eq__(self, other):
-        return (other is not None and
-                type(other) == Version and self.version == other.version)
+        # Versions are interned, so equal versions are usually the same
+        # object.  Other types get a chance to compare via NotImplemented.
+        if self is other:
+            return True
+        if type(other) is not Version:
+            return NotImplemented
+        return self.version == other.version
 
-    @coerced
     def __ne__(self, other):
-        return not (self == other)
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
 
-    @coerced
     def __le__(self, other):
-        return self == other or self < other
+        if type(other) is Version:
+            return self._cmp_key <= other._cmp_key
+        return _compare_coerced(self, other, operator.le, False)
 
-    @coerced
     def __ge__(self, other):
-        return not (self < other)
+        if type(other) is Version:
+            return self._cmp_key >= other._cmp_key
+        return _compare_coerced(self, other, operator.ge, True)
 
-    @coerced
     def __gt__(self, other):
-        return not (self == other) and not (self < other)
+        if type(other) is Version:
+            return self._cmp_key > other._cmp_key
+        return _compare_coerced(self, other, operator.gt, True)
 
     def __hash__(self):
-        return hash(self.version)
+        return self._hash
 
-    @coerced
     def __contains__(self, other):
-        if other is None:
-            return False
-        return other.version[:len(self.version)] == self.version
+        if type(other) is Version:
+            return other.version[:len(self.version)] == self.version
+        return _compare_coerced(self, other, operator.contains, False)
 
     def is_predecessor(self, other):
         """True if the other version is the immediate predecessor of this one.
@@ -376,6 +466,7 @@ def intersection(self, other):
 
 
 class VersionRange(object):
+    __slots__ = ('start', 'end', '_sort_key', '_hash')
 
     def __init__(self, start, end):
         if isinstance(start, string_types):
@@ -385,53 +476,60 @@ def __init__(self, start, end):
 
         self.start = start
         self.end = end
-        if start and end and end < start:
+
+        # Both endpoints are Versions here, so compare their keys directly
+        # instead of going through the coerced comparison operators.
+        if start and end and end._cmp_key < start._cmp_key:
             raise ValueError("Invalid Version range: %s" % self)
 
+        # Key used by __lt__.  An open start sorts before any version, and
+        # an open end sorts after any version.
+        self._sort_key = (
+            (0,) if start is None else (1, start._cmp_key),
+            (1,) if end is None else (0, end._cmp_key))
+        self._hash = hash((start, end))
+
     def lowest(self):
         return self.start
 
     def highest(self):
         return self.end
 
-    @coerced
     def __lt__(self, other):
         """Sort VersionRanges lexicographically so that they are ordered first
            by start and then by end.  None denotes an open range, so None in
            the start position is less than everything except None, and None in
            the end position is greater than everything but None.
         """
-        if other is None:
-            return False
-
-        s, o = self, other
-        if s.start != o.start:
-            return s.start is None or (
-                o.start is not None and s.start < o.start)
-        return (s.end != o.end and
-                o.end is None or (s.end is not None and s.end < o.end))
+        if type(other) is VersionRange:
+            return self._sort_key < other._sort_key
+        return _compare_coerced(self, other, operator.lt, False)
 
-    @coerced
     def __eq__(self, other):
-        return (other is not None and
-                type(other) == VersionRange and
-                self.start == other.start and self.end == other.end)
+        # Ranges parsed from the same string are the same object
+        if self is other:
+            return True
+        if type(other) is VersionRange:
+            return self._sort_key == other._sort_key
+        return _compare_coerced(self, other, operator.eq, False)
 
-    @coerced
     def __ne__(self, other):
         return not (self == other)
 
-    @coerced
     def __le__(self, other):
-        return self == other or self < other
+        if type(other) is VersionRange:
+            return self._sort_key <= other._sort_key
+        return _compare_coerced(self, other, operator.le, False)
 
-    @coerced
     def __ge__(self, other):
-        return not (self < other)
+        if type(other) is VersionRange:
+            return self._sort_key >= other._sort_key
+        return _compare_coerced(self, other, operator.ge, True)
 
-    @coerced
     def __gt__(self, other):
-        return not (self == other) and not (self < other)
+        if type(other) is VersionRange:
+            return self._sort_key > other._sort_key
+        return _compare_coerced(self, other, operator.gt, True)
 
     @property
     def concrete(self):
@@ -562,7 +660,10 @@ def intersection(self, other):
             return VersionList()
 
     def __hash__(self):
-        return hash((self.start, self.end))
+        return self._hash
+
+    def __reduce__(self):
+        return (type(self), (self.start, self.end))
 
     def __repr__(self):
         return self.__str__()
@@ -577,11 +678,58 @@ def __str__(self):
         return out
 
 
+def _sort_key(version):
+    """Key that orders a mix of Versions and VersionRanges the same way as
+    their comparison operators do, treating a Version v as the range v:v.
+    """
+    if type(version) == VersionRange:
+        return version._sort_key
+    key = version._cmp_key
+    return ((1, key), (0, key))
+
+
+def _ends_before(a, b):
+    """True if the element a of a VersionList cannot extend past the element
+    b of another one, so that nothing after a can intersect b.
+
+    A version contains the versions it is a prefix of, so e.g. a range
+    ending at 1.6 extends past one ending at 1.6.5.
+    """
+    a_end, b_end = a.highest(), b.highest()
+    if a_end is None:
+        return False
+    elif b_end is None or a_end in b_end:
+        return True
+    elif b_end in a_end:
+        return False
+    return a_end < b_end
+
+
+def _merge_sorted(a, a_keys, b, b_keys):
+    """Merge two sorted sequences of versions, given their sort keys, into
+    one sorted list."""
+    merged = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if b_keys[j] < a_keys[i]:
+            merged.append(b[j])
+            j += 1
+        else:
+            merged.append(a[i])
+            i += 1
+    merged.extend(a[i:])
+    merged.extend(b[j:])
+    return merged
+
+
 class VersionList(object):
     """Sorted, non-redundant list of Versions and VersionRanges."""
+    __slots__ = ('versions', '_keys', '_hash')
 
     def __init__(self, vlist=None):
         self.versions = []
+        self._keys = None
+        self._hash = None
         if vlist is not None:
             if isinstance(vlist, string_types):
                 vlist = _string_to_version(vlist)
@@ -590,9 +738,69 @@ def __init__(self, vlist=None):
                 else:
                     self.versions = [vlist]
             else:
-                vlist = list(vlist)
+                # Sort everything once and merge in a single pass, rather
+                # than inserting each element with add(), which is O(n^2).
+                # Sorting by key compares plain tuples instead of calling
+                # the comparison operators of the versions.
+                versions = []
                 for v in vlist:
-                    self.add(ver(v))
+                    v = ver(v)
+                    if type(v) == VersionList:
+                        versions.extend(v.versions)
+                    else:
+                        versions.append(v.concrete or v)
+                self._extend_sorted(sorted(versions, key=_sort_key))
+
+    @classmethod
+    def _from_sorted(cls, versions):
+        """Make a VersionList from versions that are already in sorted order,
+        without sorting them again."""
+        vlist = cls()
+        vlist._extend_sorted(v.concrete or v for v in versions)
+        return vlist
+
+    def _extend_sorted(self, versions):
+        """Append versions that are in sorted order to this list, merging
+        any that overlap."""
+        self._thaw()
+        self._clear_caches()
+        for version in versions:
+            while self.versions and version.overlaps(self.versions[-1]):
+                version = version.union(self.versions.pop())
+            self.versions.append(version)
+
+    def _clear_caches(self):
+        """Forget everything computed from self.versions.  Call this after
+        changing self.versions."""
+        self._keys = None
+        self._hash = None
+
+    def freeze(self):
+        """Store the versions of this list in a tuple rather than a list.
+
+        Frozen lists take less memory, and copies of them can share the
+        same tuple.  Anything that changes the list thaws it first, so a
+        frozen list can still be changed.  Lists are frozen when they are
+        first hashed.
+        """
+        self.versions = tuple(self.versions)
+
+    def _thaw(self):
+        """Make self.versions a list again, so that it can be changed."""
+        if type(self.versions) is tuple:
+            self.versions = list(self.versions)
+
+    def _sort_keys(self):
+        """Sort keys of the versions in this list.
+
+        These are kept in a list parallel to self.versions, so that add()
+        can bisect with plain tuple comparisons.  They are built lazily,
+        and any code that changes self.versions other than add() must
+        call _clear_caches().
+        """
+        if self._keys is None:
+            self._keys = [_sort_key(v) for v in self.versions]
+        return self._keys
 
     def add(self, version):
         if type(version) in (Version, VersionRange):
@@ -600,18 +808,24 @@ def add(self, version):
             if version.concrete:
                 version = version.concrete
 
-            i = bisect_left(self, version)
+            self._thaw()
+            keys = self._sort_keys()
+            i = bisect_left(keys, _sort_key(version))
+            self._hash = None
 
             while i - 1 >= 0 and version.overlaps(self[i - 1]):
                 version = version.union(self[i - 1])
                 del self.versions[i - 1]
+                del keys[i - 1]
                 i -= 1
 
             while i < len(self) and version.overlaps(self[i]):
                 version = version.union(self[i])
                 del self.versions[i]
+                del keys[i]
 
             self.versions.insert(i, version)
+            keys.insert(i, _sort_key(version))
 
         elif type(version) == VersionList:
             for v in version:
@@ -646,13 +860,11 @@ def highest(self):
 
     def highest_numeric(self):
         """Get the highest numeric version in the list."""
-        numeric_versions = list(filter(
-            lambda v: str(v) not in infinity_versions,
-            self.versions))
-        if not any(numeric_versions):
-            return None
-        else:
-            return numeric_versions[-1].highest()
+        # The list is sorted, so the first match from the end is the highest
+        for v in reversed(self.versions):
+            if str(v) not in _INF_SET:
+                return v.highest()
+        return None
 
     def preferred(self):
         """Get the preferred (latest) version in the list."""
@@ -666,11 +878,14 @@ def overlaps(self, other):
         if not other or not self:
             return False
 
+        # Step through the lists comparing precomputed sort keys, which are
+        # plain tuples, rather than the versions themselves.
+        self_keys, other_keys = self._sort_keys(), other._sort_keys()
         s = o = 0
-        while s < len(self) and o < len(other):
-            if self[s].overlaps(other[o]):
+        while s < len(self_keys) and o < len(other_keys):
+            if self.versions[s].overlaps(other.versions[o]):
                 return True
-            elif self[s] < other[o]:
+            elif self_keys[s] < other_keys[o]:
                 s += 1
             else:
                 o += 1
@@ -691,7 +906,9 @@ def to_dict(self):
     def from_dict(dictionary):
         """Parse dict from to_dict."""
         if 'versions' in dictionary:
-            return VersionList(dictionary['versions'])
+            # to_dict() writes the versions in order
+            return VersionList._from_sorted(
+                ver(v) for v in dictionary['versions'])
         elif 'version' in dictionary:
             return VersionList([dictionary['version']])
         else:
@@ -712,60 +929,174 @@ def satisfies(self, other, strict=False):
             return False
 
         if strict:
-            return self in other
+            return other._contains(self)
 
+        self_keys, other_keys = self._sort_keys(), other._sort_keys()
         s = o = 0
-        while s < len(self) and o < len(other):
-            if self[s].satisfies(other[o]):
+        while s < len(self_keys) and o < len(other_keys):
+            if self.versions[s].satisfies(other.versions[o]):
                 return True
-            elif self[s] < other[o]:
+            elif self_keys[s] < other_keys[o]:
                 s += 1
             else:
                 o += 1
         return False
 
+    def compile_satisfies(self):
+        """Make a function that tells whether a Version satisfies this list.
+
+        ``vlist.compile_satisfies()(v)`` is the same as
+        ``v.satisfies(vlist)``, but it does not build a VersionList for each
+        version it checks, so it is much faster for checking many versions
+        against the same list.  The function sees the list as it is when it
+        is compiled, so compile it again if the list changes.
+        """
+        elements = list(zip(self.versions, self._sort_keys()))
+
+        def satisfies(version):
+            key = _sort_key(version)
+            point = None
+            for element, element_key in elements:
+                if type(element) is Version:
+                    if version.satisfies(element):
+                        return True
+                else:
+                    if point is None:
+                        point = VersionRange(version, version)
+                    if point.satisfies(element):
+                        return True
+
+                # The list is sorted, so nothing after this can match
+                if key < element_key:
+                    return False
+            return False
+
+        return satisfies
+
     @coerced
     def update(self, other):
-        for v in other.versions:
-            self.add(v)
+        self._update(other)
+
+    def _update(self, other):
+        """update() without coercion, for when other is a VersionList."""
+        if len(other) <= 1:
+            for v in other.versions:
+                self.add(v)
+            return
+
+        # Merge both sorted lists in one pass rather than adding each
+        # version of other separately.
+        merged = _merge_sorted(
+            self.versions, self._sort_keys(),
+            [v.concrete or v for v in other.versions], other._sort_keys())
+        self.versions = []
+        self._extend_sorted(merged)
 
     @coerced
     def union(self, other):
-        result = self.copy()
-        result.update(other)
-        return result
+        return VersionList._from_sorted(_merge_sorted(
+            self.versions, self._sort_keys(),
+            other.versions, other._sort_keys()))
 
     @coerced
     def intersection(self, other):
-        # TODO: make this faster.  This is O(n^2).
+        return self._intersection(other)
+
+    def _intersection(self, other):
+        """intersection() without coercion, for when other is a VersionList.
+        """
+        if len(self) * 10 <= len(other) or len(other) * 10 <= len(self):
+            isections = self._lopsided_intersections(other)
+        else:
+            isections = self._merged_intersections(other)
+
         result = VersionList()
-        for s in self:
-            for o in other:
-                result.add(s.intersection(o))
+        result._extend_sorted(isections)
         return result
 
+    def _merged_intersections(self, other):
+        """Sorted intersections of the elements of two lists of similar size.
+        """
+        # Both lists are sorted and non-overlapping, so walk them together
+        # like a merge.  Each element can only intersect the elements of
+        # the other list up to the point where one of the two ends.
+        mine, theirs = self.versions, other.versions
+        isections = []
+        s = o = 0
+        while s < len(mine) and o < len(theirs):
+            a, b = mine[s], theirs[o]
+            isection = a.intersection(b)
+            if type(isection) != VersionList:
+                isections.append(isection.concrete or isection)
+
+            if _ends_before(a, b):
+                s += 1
+            else:
+                o += 1
+        return isections
+
+    def _lopsided_intersections(self, other):
+        """Sorted intersections of the elements of two lists when one is
+        much longer than the other.
+        """
+        # For each element of the short list, bisect into the long one
+        # instead of walking all of it.  Only the element just before the
+        # insertion point can start earlier and still reach into it.
+        if len(self) < len(other):
+            small, large = self, other
+        else:
+            small, large = other, self
+
+        isections = []
+        keys = large._sort_keys()
+        for version in small:
+            i = max(bisect_left(keys, _sort_key(version)) - 1, 0)
+            while i < len(large):
+                if small is self:
+                    isection = version.intersection(large[i])
+                else:
+                    isection = large[i].intersection(version)
+                if type(isection) != VersionList:
+                    isections.append(isection.concrete or isection)
+
+                if _ends_before(version, large[i]):
+                    break
+                i += 1
+        return isections
+
     @coerced
     def intersect(self, other):
         """Intersect this spec's list with other.
 
         Return True if the spec changed as a result; False otherwise
         """
-        isection = self.intersection(other)
-        changed = (isection.versions != self.versions)
+        isection = self._intersection(other)
+
+        # Only compare element by element if the length is the same, and
+        # stop at the first difference.
+        changed = (len(isection) != len(self) or any(
+            a != b for a, b in zip(isection.versions, self.versions)))
         self.versions = isection.versions
+        self._clear_caches()
         return changed
 
     @coerced
     def __contains__(self, other):
+        return self._contains(other)
+
+    def _contains(self, other):
+        """__contains__() without coercion, for when other is a VersionList.
+        """
         if len(self) == 0:
             return False
 
+        versions, keys = self.versions, self._sort_keys()
         for version in other:
-            i = bisect_left(self, other)
-            if i == 0:
-                if version not in self[0]:
-                    return False
-            elif all(version not in v for v in self[i - 1:]):
+            # Elements of this list are sorted and don't overlap, so only
+            # the ones on either side of where version would go can hold it.
+            i = bisect_left(keys, _sort_key(version))
+            if not ((i > 0 and version in versions[i - 1]) or
+                    (i < len(versions) and version in versions[i])):
                 return False
 
         return True
@@ -787,7 +1118,15 @@ def __bool__(self):
 
     @coerced
     def __eq__(self, other):
-        return other is not None and self.versions == other.versions
+        if other is None:
+            return False
+        # Copies of a frozen list share its tuple
+        if self.versions is other.versions:
+            return True
+        if len(self.versions) != len(other.versions):
+            return False
+        mine, theirs = self._comparable_versions(other)
+        return mine == theirs
 
     @coerced
     def __ne__(self, other):
@@ -795,7 +1134,19 @@ def __ne__(self, other):
 
     @coerced
     def __lt__(self, other):
-        return other is not None and self.versions < other.versions
+        if other is None:
+            return False
+        mine, theirs = self._comparable_versions(other)
+        return mine < theirs
+
+    def _comparable_versions(self, other):
+        """The versions of this list and other, as sequences of the same
+        type.  Frozen lists keep their versions in a tuple, and lists and
+        tuples don't compare with each other."""
+        mine, theirs = self.versions, other.versions
+        if type(mine) is not type(theirs):
+            mine, theirs = tuple(mine), tuple(theirs)
+        return mine, theirs
 
     @coerced
     def __le__(self, other):
@@ -810,49 +1161,84 @@ def __gt__(self, other):
         return not (self == other) and not (self < other)
 
     def __hash__(self):
-        return hash(tuple(self.versions))
+        if self._hash is None:
+            self.freeze()
+            self._hash = hash(self.versions)
+        return self._hash
+
+    def __getstate__(self):
+        return (self.versions,)
+
+    def __setstate__(self, state):
+        self.versions, = state
+        self._clear_caches()
 
     def __str__(self):
-        return ",".join(str(v) for v in self.versions)
+        return ",".join([str(v) for v in self.versions])
 
     def __repr__(self):
-        return str(self.versions)
+        return str(list(self.versions))
+
+
+# Results of _string_to_version().  Like those of int_if_int(), a bounded
+# number of them are cached, so that parsed versions are not all kept alive.
+_string_to_version_cache = {}
 
 
 def _string_to_version(string):
     """Converts a string to a Version, VersionList, or VersionRange.
        This is private.  Client code should use ver().
+
+       Results are cached, so VersionLists returned from here are frozen
+       and shared, and must be copied before they are handed out.
     """
-    string = string.replace(' ', '')
+    version = _string_to_version_cache.get(string)
+    if version is not None:
+        return version
 
-    if ',' in string:
-        return VersionList(string.split(','))
+    stripped = string.replace(' ', '')
 
-    elif ':' in string:
-        s, e = string.split(':')
+    if ',' in stripped:
+        version = VersionList(stripped.split(','))
+        version.freeze()
+
+    elif ':' in stripped:
+        s, e = stripped.split(':')
         start = Version(s) if s else None
         end = Version(e) if e else None
-        return VersionRange(start, end)
+        version = VersionRange(start, end)
 
     else:
-        return Version(string)
+        version = Version(stripped)
+
+    if len(_string_to_version_cache) < _parse_cache_size:
+        _string_to_version_cache[string] = version
+    return version
 
 
 def ver(obj):
     """Parses a Version, VersionRange, or VersionList from a string
        or list of strings.
     """
-    if isinstance(obj, (list, tuple)):
+    if isinstance(obj, string_types):
+        version = _string_to_version(obj)
+    elif isinstance(obj, (list, tuple)):
         return VersionList(obj)
-    elif isinstance(obj, string_types):
-        return _string_to_version(obj)
     elif isinstance(obj, (int, float)):
-        return _string_to_version(str(obj))
+        version = _string_to_version(str(obj))
     elif type(obj) in (Version, VersionRange, VersionList):
         return obj
     else:
         raise TypeError("ver() can't convert %s to version!" % type(obj))
 
+    # VersionLists can be changed in place, so don't hand out the cached one.
+    # It is frozen, so the copy can share its versions.
+    if type(version) == VersionList:
+        copy = VersionList()
+        copy.versions = version.versions
+        return copy
+    return version
+
 
 class VersionError(spack.error.SpackError):
     """This is raised when something is wrong with a version."""
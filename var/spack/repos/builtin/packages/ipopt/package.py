@@ -46,6 +46,13 @@ class Ipopt(AutotoolsPackage):
     # IPOPT does not build correctly in parallel on OS X
     parallel = False
 
+    # Optional dependencies, by the variant that enables them and the name
+    # configure uses for them
+    optional_deps = [
+        ('coinhsl', 'hsl'),
+        ('metis', 'metis'),
+    ]
+
     def configure_args(self):
         spec = self.spec
         # Dependency directories
@@ -73,15 +80,12 @@ def configure_args(self):
             "--with-lapack-lib=%s" % lapack_lib
         ]
 
-        if 'coinhsl' in spec:
-            args.extend([
-                '--with-hsl-lib=%s' % spec['coinhsl'].libs.ld_flags,
-                '--with-hsl-incdir=%s' % spec['coinhsl'].prefix.include])
-
-        if 'metis' in spec:
-            args.extend([
-                '--with-metis-lib=%s' % spec['metis'].libs.ld_flags,
-                '--with-metis-incdir=%s' % spec['metis'].prefix.include])
+        for variant, name in self.optional_deps:
+            if '+' + variant in spec:
+                dep = spec[variant]
+                args.extend([
+                    '--with-%s-lib=%s' % (name, dep.libs.ld_flags),
+                    '--with-%s-incdir=%s' % (name, dep.prefix.include)])
 
         # The IPOPT configure file states that '--enable-debug' implies
         # '--disable-shared', but adding '--enable-shared' overrides